@@ -38,10 +38,12 @@ def parse_auth_line(line):
 
 if __name__ == "__main__":
     per_ip_timestamps = defaultdict(list)
+    ip_cache = {}   # one shared str per distinct IP instead of a fresh copy per line
     with open(LOGFILE) as f:
         for line in f:
             ts, ip, event = parse_auth_line(line)
             if ts and ip and event == "failed":   # checks that ts and ip are not null, and that event=="failed"
+                ip = ip_cache.setdefault(ip, ip)
                 per_ip_timestamps[ip].append(ts)
     
     # quick print
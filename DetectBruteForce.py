@@ -1,75 +1,90 @@
 # lab2.3 Detect Brute-force Bursts 
 import json
+import re
 from collections import defaultdict
 from datetime import datetime
 
 LOGFILE = "sample_auth_small.log"
 
+# timestamp and source IP of a failed-password line, matched in one pass
+_LINE_RE = re.compile(
+    r"^(\w{3} [ 0-9]\d \d\d:\d\d:\d\d) .*Failed password.* from (\d{1,3}(?:\.\d{1,3}){3})"
+)
+
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+
 def parse_auth_line(line):
     """
     Parse an auth log line and return (timestamp, ip, event_type)
     Example auth line:
     Mar 10 13:58:01 host1 sshd[1023]: Failed password for invalid user admin from 203.0.113.45 port 52344 ssh2
     We will:
+     - match the line against _LINE_RE (failed-password lines only)
      - parse timestamp (assume year 2025)
-     - extract IP (token after 'from')
-     - event_type: 'failed' if 'Failed password', 'accepted' if 'Accepted password', else 'other'
+     - extract IP (dotted quad after 'from')
+     - event_type: 'failed' on a match, else 'other'
+    Only IPv4 sources match, so failed logins from IPv6 addresses or hostnames
+    come back as 'other' and are not counted.
     """
-    parts = line.split()
-    # timestamp: first 3 tokens 'Mar 10 13:58:01'
-    ts_str = " ".join(parts[0:3])
+    m = _LINE_RE.match(line)
+    if not m:
+        return None, None, "other"
+    # fixed "%b %d %H:%M:%S" layout, so skip strptime and convert the pieces directly
+    mon, day, clock = m.group(1).split()
     try:
-        ts = datetime.strptime(f"2025 {ts_str}", "%Y %b %d %H:%M:%S")
-    except Exception:
-        ts = None
-    ip = None
-    event_type = "other"
-    if "Failed password" in line:
-        event_type = "failed"
-    elif "Accepted password" in line or "Accepted publickey" in line:
-        event_type = "accepted"
-    if " from " in line:
-        try:
-            idx = parts.index("from")
-            ip = parts[idx+1]
-        except (ValueError, IndexError):
-            ip = None
-    return ts, ip, event_type
+        hh, mm, ss = clock.split(":")
+        ts = datetime(2025, _MONTHS[mon], int(day), int(hh), int(mm), int(ss))
+    except (KeyError, ValueError):
+        return None, None, "other"
+    ip = m.group(2)
+    return ts, ip, "failed"
   
 def brute_force(per_ip_timestamps, max_minutes=10, threshold = 5):
   from datetime import timedelta
 
   sus_incidents = []
-  window = timedelta(minutes=10)
+  window = timedelta(minutes=max_minutes)
   for ip, times in per_ip_timestamps.items():
-      times.sort()
       n = len(times)
-      i = 0
+      # too few attempts for any burst: skip the sort and the scan
+      if n < threshold:
+          continue
+      # log lines are nearly always in time order already, so check before sorting
+      if any(times[k] > times[k+1] for k in range(n - 1)):
+          times.sort()
+      # two pointers: j never moves back, since a later start can only reach further
+      i = j = 0
       while i < n:
-        j = i
-        # Expand window while the time difference is <=10 minutes
+        if j < i:
+            j = i
+        # Expand window while the time difference is <= max_minutes
         while j + 1 < n and (times[j+1] - times[i]) <= window:
             j += 1
-            count = j - i + 1
-            if count >= threshold:
-                sus_incidents.append({
-                    "ip": ip,
-                    "count": count,
-                    "first": times[i].isoformat(),
-                    "last": times[j].isoformat()
-                })
-                # advance i past this cluster to avoid duplicate overlapping reports:
-                i = j + 1
-            else:
-                i += 1
-        return sus_incidents
+        count = j - i + 1
+        if count >= threshold:
+            sus_incidents.append({
+                "ip": ip,
+                "count": count,
+                "first": times[i].isoformat(),
+                "last": times[j].isoformat()
+            })
+            # advance i past this cluster to avoid duplicate overlapping reports:
+            i = j + 1
+        else:
+            i += 1
+  return sus_incidents
 
 if __name__ == "__main__":
     per_ip_timestamps = defaultdict(list)
+    ip_cache = {}   # one shared str per distinct IP instead of a fresh copy per line
     with open(LOGFILE) as f:
         for line in f:
             ts, ip, event = parse_auth_line(line)
             if ts and ip and event == "failed":   # checks that ts and ip are not null, and that event=="failed"
+                ip = ip_cache.setdefault(ip, ip)
                 per_ip_timestamps[ip].append(ts)
     # quick print for failed attempts per IP
     for ip, times in per_ip_timestamps.items():
@@ -1,7 +1,14 @@
 import json
+import os
+import sys
+import matplotlib
+# only bring up a GUI window for interactive runs; batch/CI runs use Agg
+INTERACTIVE = sys.stdout.isatty() and bool(os.environ.get("DISPLAY"))
+if not INTERACTIVE:
+    matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import json
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import datetime
 
 LOGFILE = "sample_auth_small.log"
@@ -41,36 +48,45 @@ def brute_force(per_ip_timestamps, max_minutes=10, threshold = 5):
   from datetime import timedelta
 
   sus_incidents = []
-  window = timedelta(minutes=10)
+  window = timedelta(minutes=max_minutes)
   for ip, times in per_ip_timestamps.items():
-      times.sort()
       n = len(times)
-      i = 0
+      # too few attempts for any burst: skip the sort and the scan
+      if n < threshold:
+          continue
+      # log lines are nearly always in time order already, so check before sorting
+      if any(times[k] > times[k+1] for k in range(n - 1)):
+          times.sort()
+      # two pointers: j never moves back, since a later start can only reach further
+      i = j = 0
       while i < n:
-        j = i
-        # Expand window while the time difference is <=10 minutes
+        if j < i:
+            j = i
+        # Expand window while the time difference is <= max_minutes
         while j + 1 < n and (times[j+1] - times[i]) <= window:
             j += 1
-            count = j - i + 1
-            if count >= threshold:
-                sus_incidents.append({
-                    "ip": ip,
-                    "count": count,
-                    "first": times[i].isoformat(),
-                    "last": times[j].isoformat()
-                })
-                # advance i past this cluster to avoid duplicate overlapping reports:
-                i = j + 1
-            else:
-                i += 1
-        return sus_incidents
+        count = j - i + 1
+        if count >= threshold:
+            sus_incidents.append({
+                "ip": ip,
+                "count": count,
+                "first": times[i].isoformat(),
+                "last": times[j].isoformat()
+            })
+            # advance i past this cluster to avoid duplicate overlapping reports:
+            i = j + 1
+        else:
+            i += 1
+  return sus_incidents
 
 if __name__ == "__main__":
     per_ip_timestamps = defaultdict(list)
+    ip_cache = {}   # one shared str per distinct IP instead of a fresh copy per line
     with open(LOGFILE) as f:
         for line in f:
             ts, ip, event = parse_auth_line(line)
             if ts and ip and event == "failed":   # checks that ts and ip are not null, and that event=="failed"
+                ip = ip_cache.setdefault(ip, ip)
                 per_ip_timestamps[ip].append(ts)
     # quick print for failed attempts per IP
     for ip, times in per_ip_timestamps.items():
@@ -94,23 +110,23 @@ with open('bruteforce_incidents.txt', 'w') as f:
     json.dump(sus_incidents, f, indent=2)
 
 # Aggregate total counts per IP from incidents
-summary = {}
+summary = Counter()
 for inc in sus_incidents:
-    summary[inc['ip']] = summary.get(inc['ip'], 0) + inc['count']
+    summary[inc['ip']] += inc['count']
 
-# Sort top attackers
-top_attackers = sorted(summary.items(), key=lambda x: x[1], reverse=True)
+# Top 10 attackers (heap-based, no full sort; ties keep first-seen order)
+top_attackers = summary.most_common(10)
 
 print("Top attackers IPs:")
-for ip, count in top_attackers[:10]:
+for ip, count in top_attackers:
     print(f"{ip}: {count} failed attempts")
     
 # A bar chart of top 10 attacker Ips 
 print("A bar chart of top 10 attacker Ips")
-ips = [ip for ip, count in top_attackers[:10]]
-counts = [count for ip, count in top_attackers[:10]]
+ips = [ip for ip, count in top_attackers]
+counts = [count for ip, count in top_attackers]
 
-plt.figure(figsize=(8, 4))
+fig = plt.figure(figsize=(8, 4))
 plt.bar(ips, counts)
 plt.title("Top attacker IPs")
 plt.xlabel("IP")
@@ -118,4 +134,6 @@ plt.ylabel("Failed attempts")
 plt.xticks(rotation=45)
 plt.tight_layout()
 plt.savefig("top_attackers.png")
-plt.show()
+if INTERACTIVE:
+    plt.show()
+plt.close(fig)
@@ -10,11 +10,105 @@ Full working script:
 - Prints summary and optionally plots top attackers if matplotlib available
 """
 
+import calendar
 import json
-from collections import defaultdict
+import mmap
+import os
+import re
+import textwrap
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 import sys
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy is optional; brute_force falls back to a plain Python scan
+    np = None
+
 LOGFILE = "sample_auth_small.log"
+# logs smaller than this are parsed in-process; worker start-up would cost more than it saves
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+# byte ranges smaller than this are scanned with the regex; importing numba (and compiling
+# on a cold cache) would cost more than the jitted scan saves
+JIT_MIN_BYTES = 64 * 1024 * 1024
+
+# All patterns live here, compiled once at import; nothing compiles per line.
+# Plain literals for the substring prefilters and the numba needles:
+_FAILED_MARK = b"Failed password"
+_FROM_MARK = b" from "
+# timestamp and source IP of a failed-password line, matched in one pass straight
+# on the mapped bytes; MULTILINE so '^' holds at a line start passed as pos
+_LINE_RE_B = re.compile(
+    rb"^(\w{3} [ 0-9]\d \d\d:\d\d:\d\d) .*Failed password.* from (\d{1,3}(?:\.\d{1,3}){3})",
+    re.MULTILINE,
+)
+
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+
+
+def _parse_syslog_ts(ts_str):
+    """
+    Turn a syslog timestamp like 'Mar 10 13:58:01' into a datetime (year 2025).
+    Same result as strptime with "%b %d %H:%M:%S" without the per-call format parsing.
+    Raises KeyError/ValueError on malformed input.
+    """
+    mon, day, clock = ts_str.split()
+    hh, mm, ss = clock.split(":")
+    return datetime(2025, _MONTHS[mon], int(day), int(hh), int(mm), int(ss))
+
+
+# failed-attempt timestamps are kept as plain ints: seconds since the start of 2025
+_YEAR_START = datetime(2025, 1, 1)
+_MONTH_OFFSETS = {
+    mon: (datetime(2025, num, 1) - _YEAR_START).days * 86400 for mon, num in _MONTHS.items()
+}
+_MONTH_DAYS = {mon: calendar.monthrange(2025, num)[1] for mon, num in _MONTHS.items()}
+
+
+def _syslog_seconds(ts_str):
+    """
+    Like _parse_syslog_ts but returns seconds since 2025-01-01 00:00:00 as an int.
+    Applies the same range checks as datetime(); raises KeyError/ValueError on malformed input.
+    """
+    mon, day, clock = ts_str.split()
+    hh, mm, ss = clock.split(":")
+    day, hh, mm, ss = int(day), int(hh), int(mm), int(ss)
+    if not (1 <= day <= _MONTH_DAYS[mon] and 0 <= hh < 24 and 0 <= mm < 60 and 0 <= ss < 60):
+        raise ValueError(f"timestamp out of range: {ts_str!r}")
+    return _MONTH_OFFSETS[mon] + (day - 1) * 86400 + hh * 3600 + mm * 60 + ss
+
+
+@lru_cache(maxsize=4096)
+def _iso(seconds):
+    """
+    ISO-8601 string for a timestamp produced by _syslog_seconds.
+    Only called when an incident fires; cached because repeated bursts share boundaries.
+    """
+    return (_YEAR_START + timedelta(seconds=int(seconds))).isoformat()
+
+
+def pack_ip(ip):
+    """
+    Pack a dotted-quad IPv4 string into one int (fits a uint32), e.g. '10.0.0.1' -> 167772161.
+    Raises ValueError if ip is not four octets in 0..255.
+    """
+    a, b, c, d = octets = [int(part) for part in ip.split(".")]
+    if max(octets) > 255 or min(octets) < 0:
+        raise ValueError(f"not an IPv4 address: {ip!r}")
+    return (a << 24) | (b << 16) | (c << 8) | d
+
+
+def unpack_ip(packed):
+    """Dotted-quad string for an IPv4 address packed by pack_ip."""
+    packed = int(packed)
+    return f"{packed >> 24}.{(packed >> 16) & 255}.{(packed >> 8) & 255}.{packed & 255}"
 
 
 def parse_auth_line(line):
@@ -29,8 +123,8 @@ def parse_auth_line(line):
     # timestamp: first 3 tokens 'Mar 10 13:58:01'
     ts_str = " ".join(parts[0:3])
     try:
-        ts = datetime.strptime(f"2025 {ts_str}", "%Y %b %d %H:%M:%S")
-    except Exception:
+        ts = _parse_syslog_ts(ts_str)
+    except (KeyError, ValueError):
         # if parsing fails, return None so caller can skip
         return None, None, "other"
 
@@ -56,59 +150,441 @@ def parse_auth_line(line):
     return ts, ip, event_type
 
 
-def brute_force(per_ip_timestamps, max_minutes=10, threshold=5):
+def _find_bursts(times, window, threshold):
+    """
+    Yield (i, j) index pairs into the sorted list times where times[i]..times[j]
+    fall within window seconds and number >= threshold. Bursts do not overlap.
+    """
+    n = len(times)
+    # the jitted sweep is only there once a large log has loaded numba (see _load_jit)
+    if _sweep_jit is not None:
+        starts, ends = _sweep_jit(np.asarray(times, dtype=np.int64), window, threshold)
+        yield from zip(starts.tolist(), ends.tolist())
+        return
+    if np is not None:
+        arr = np.asarray(times, dtype=np.int64)
+        # last index still inside the window for every start, computed in one go
+        ends = np.searchsorted(arr, arr + window, side="right") - 1
+        counts = ends - np.arange(n) + 1
+        next_start = 0
+        for i in np.flatnonzero(counts >= threshold):
+            if i < next_start:
+                continue
+            j = int(ends[i])
+            yield int(i), j
+            # advance past this cluster to avoid overlapping duplicates
+            next_start = j + 1
+        return
+
+    # two pointers: j never moves back, since a later start can only reach further
+    i = j = 0
+    while i < n:
+        if j < i:
+            j = i
+        # expand j as far as possible while within window relative to times[i]
+        while j + 1 < n and (times[j + 1] - times[i]) <= window:
+            j += 1
+        count = j - i + 1
+        if count >= threshold:
+            yield i, j
+            # advance i past this cluster to avoid overlapping duplicates
+            i = j + 1
+        else:
+            i += 1
+
+
+def _is_sorted(times):
+    """True if times is in non-decreasing order (a single O(n) pass)."""
+    return all(times[k] <= times[k + 1] for k in range(len(times) - 1))
+
+
+def brute_force(per_ip_timestamps, max_minutes=10, threshold=5, presorted=False):
     """
     Sliding window detection. For each IP, find windows of length max_minutes
-    with >= threshold failed attempts. Return list of incidents.
+    with >= threshold failed attempts. Keys are packed IPs (pack_ip) and
+    timestamps are ints from _syslog_seconds. Pass presorted=True only if every
+    run is already in time order; the order check is then skipped.
+    Yields incidents one at a time.
     Each incident is a dict: {"ip","count","first","last"}
     """
-    sus_incidents = []
-    window = timedelta(minutes=max_minutes)
+    window = max_minutes * 60
 
     for ip, times in per_ip_timestamps.items():
-        # ensure times sorted
-        times.sort()
-        n = len(times)
-        i = 0
-        while i < n:
-            j = i
-            # expand j as far as possible while within window relative to times[i]
-            while j + 1 < n and (times[j + 1] - times[i]) <= window:
-                j += 1
-            count = j - i + 1
-            if count >= threshold:
-                sus_incidents.append({
-                    "ip": ip,
-                    "count": count,
-                    "first": times[i].isoformat(),
-                    "last": times[j].isoformat()
-                })
-                # advance i past this cluster to avoid overlapping duplicates
-                i = j + 1
-            else:
-                i += 1
-
-    return sus_incidents
-
-
-def print_incidents_preview(sus_incidents, preview=5):
-    print(f"Detected {len(sus_incidents)} brute-force incidents")
+        # too few attempts for any burst: skip the sort and the scan
+        if len(times) < threshold:
+            continue
+        # log order is nearly always time order, so check before sorting
+        if not presorted and not _is_sorted(times):
+            times = sorted(times)
+        for i, j in _find_bursts(times, window, threshold):
+            yield {
+                "ip": unpack_ip(ip),
+                "count": j - i + 1,
+                "first": _iso(times[i]),
+                "last": _iso(times[j])
+            }
+
+
+def write_incidents(sus_incidents, out):
+    """
+    Write incidents to out as one JSON array, laid out like json.dump(..., indent=2),
+    without holding them all in memory. Returns the number written.
+    The closing bracket is written even if producing an incident fails,
+    so the file stays valid JSON.
+    """
+    total = 0
+    out.write("[")
+    try:
+        for inc in sus_incidents:
+            out.write(",\n" if total else "\n")
+            out.write(textwrap.indent(json.dumps(inc, indent=2), "  "))
+            total += 1
+    finally:
+        out.write("\n]" if total else "]")
+    return total
+
+
+def print_incidents_preview(sus_incidents, preview=5, total=None):
+    if total is None:
+        total = len(sus_incidents)
+    print(f"Detected {total} brute-force incidents")
     for incident in sus_incidents[:preview]:
         print(incident)
-    if len(sus_incidents) > preview:
+    if total > preview:
         print("...")
 
 
+def _find_bytes(buf, start, end, needle):
+    """Index of needle in buf[start:end], or -1."""
+    m = len(needle)
+    last = end - m
+    i = start
+    while i <= last:
+        k = 0
+        while k < m and buf[i + k] == needle[k]:
+            k += 1
+        if k == m:
+            return i
+        i += 1
+    return -1
+
+
+def _rfind_bytes(buf, start, end, needle):
+    """Index of the last needle in buf[start:end], or -1."""
+    m = len(needle)
+    i = end - m
+    while i >= start:
+        k = 0
+        while k < m and buf[i + k] == needle[k]:
+            k += 1
+        if k == m:
+            return i
+        i -= 1
+    return -1
+
+
+def _parse_ip_bytes(buf, pos, end):
+    """
+    Byte-level pack_ip for the IPv4 at buf[pos:]. Returns -1 if the bytes do not have
+    the shape of _LINE_RE_B's IP group, -2 if they do but an octet is above 255.
+    """
+    packed = 0
+    bad_octet = False
+    for part in range(4):
+        if part:
+            if pos >= end or buf[pos] != 46:  # '.'
+                return -1
+            pos += 1
+        value = 0
+        digits = 0
+        while digits < 3 and pos < end and 48 <= buf[pos] <= 57:
+            value = value * 10 + int(buf[pos]) - 48
+            pos += 1
+            digits += 1
+        if digits == 0:
+            return -1
+        if value > 255:
+            bad_octet = True
+        packed = (packed << 8) | value
+    return -2 if bad_octet else packed
+
+
+def _scan_failed(buf, start, end, failed, sep, month_keys, month_offsets, month_days):
+    """
+    Byte-level version of the collect_failed_attempts scan, written for numba.
+    buf is the log as a uint8 array; failed/sep are the _FAILED_MARK / _FROM_MARK
+    needles and month_keys/month_offsets/month_days the month table as arrays.
+    Returns (ips, ts): packed IPv4 addresses and _syslog_seconds timestamps.
+    """
+    # a failed-password line is at least 40 bytes, which bounds the number of hits
+    cap = (end - start) // 40 + 1
+    ips = np.empty(cap, np.int64)
+    tss = np.empty(cap, np.int64)
+    n = 0
+    pos = start
+    while pos < end:
+        nl = pos
+        while nl < end and buf[nl] != 10:  # '\n'
+            nl += 1
+        k = _find_bytes(buf, pos, nl, failed)
+        # 'Mmm dd hh:mm:ss ' prefix, as anchored by _LINE_RE_B
+        if k >= 0 and nl - pos > 16 and buf[pos + 3] == 32 and buf[pos + 15] == 32:
+            key = (int(buf[pos]) << 16) | (int(buf[pos + 1]) << 8) | int(buf[pos + 2])
+            mon = -1
+            for m in range(len(month_keys)):
+                if month_keys[m] == key:
+                    mon = m
+            day = int(buf[pos + 5]) - 48
+            if buf[pos + 4] != 32:
+                day += (int(buf[pos + 4]) - 48) * 10
+            hh = (int(buf[pos + 7]) - 48) * 10 + int(buf[pos + 8]) - 48
+            mi = (int(buf[pos + 10]) - 48) * 10 + int(buf[pos + 11]) - 48
+            ss = (int(buf[pos + 13]) - 48) * 10 + int(buf[pos + 14]) - 48
+            ok = mon >= 0 and buf[pos + 9] == 58 and buf[pos + 12] == 58  # ':'
+            # same range checks as _syslog_seconds
+            if ok and not (1 <= day <= month_days[mon] and hh < 24 and mi < 60 and ss < 60):
+                ok = False
+            for d in (pos + 5, pos + 7, pos + 8, pos + 10, pos + 11, pos + 13, pos + 14):
+                if not 48 <= buf[d] <= 57:
+                    ok = False
+            if buf[pos + 4] != 32 and not 48 <= buf[pos + 4] <= 57:
+                ok = False
+            # like the greedy _LINE_RE_B, take the last ' from <ip>' on the line: sshd logs
+            # the attempted username verbatim, so an earlier one may be attacker-supplied
+            ip = -1
+            lo = k + len(failed)
+            f = _rfind_bytes(buf, lo, nl, sep) if ok else -1
+            while f >= 0:
+                ip = _parse_ip_bytes(buf, f + len(sep), nl)
+                if ip != -1:
+                    break
+                f = _rfind_bytes(buf, lo, f + len(sep) - 1, sep)
+            # -2: the regex would match this address too, and pack_ip then rejects it
+            if ip >= 0:
+                ips[n] = ip
+                tss[n] = month_offsets[mon] + (day - 1) * 86400 + hh * 3600 + mi * 60 + ss
+                n += 1
+        pos = nl + 1
+    return ips[:n], tss[:n]
+
+
+def _sweep(times, window, threshold):
+    """Two-pointer burst scan over a sorted int64 array; returns (starts, ends) arrays."""
+    n = len(times)
+    # bursts do not overlap and hold >= threshold items each
+    cap = n // max(threshold, 1) + 1
+    starts = np.empty(cap, np.int64)
+    ends = np.empty(cap, np.int64)
+    k = 0
+    i = j = 0
+    while i < n:
+        if j < i:
+            j = i
+        while j + 1 < n and times[j + 1] - times[i] <= window:
+            j += 1
+        if j - i + 1 >= threshold:
+            starts[k] = i
+            ends[k] = j
+            k += 1
+            i = j + 1
+        else:
+            i += 1
+    return starts[:k], ends[:k]
+
+
+# numba is optional too; _load_jit imports it and fills these in on first use
+_scan_failed_jit = _sweep_jit = None
+
+
+def _load_jit():
+    """
+    Import numba and compile the byte-level scanner and the burst sweep (cached on disk).
+    Returns False, leaving the regex parser and numpy/Python scans in use, without numba.
+    """
+    global _find_bytes, _rfind_bytes, _parse_ip_bytes, _scan_failed_jit, _sweep_jit
+    global _FAILED_NEEDLE, _FROM_NEEDLE, _MONTH_KEYS, _MONTH_OFFSET_ARR, _MONTH_DAYS_ARR
+    if _scan_failed_jit is not None:
+        return True
+    if np is None:
+        return False
+    try:
+        from numba import njit
+    except ImportError:
+        return False
+    # _scan_failed looks its helpers up as globals when it compiles, so rebind them first
+    _find_bytes = njit(cache=True)(_find_bytes)
+    _rfind_bytes = njit(cache=True)(_rfind_bytes)
+    _parse_ip_bytes = njit(cache=True)(_parse_ip_bytes)
+    _FAILED_NEEDLE = np.frombuffer(_FAILED_MARK, dtype=np.uint8)
+    _FROM_NEEDLE = np.frombuffer(_FROM_MARK, dtype=np.uint8)
+    _MONTH_KEYS = np.array([int.from_bytes(mon.encode(), "big") for mon in _MONTHS], dtype=np.int64)
+    _MONTH_OFFSET_ARR = np.array(list(_MONTH_OFFSETS.values()), dtype=np.int64)
+    _MONTH_DAYS_ARR = np.array(list(_MONTH_DAYS.values()), dtype=np.int64)
+    _sweep_jit = njit(cache=True)(_sweep)
+    _scan_failed_jit = njit(cache=True)(_scan_failed)
+    return True
+
+
+def _index_ip(packed_to_idx, ip_packed, packed):
+    """
+    Index of the packed address in ip_packed, appending it if new. packed_to_idx caches
+    packed -> index, so spellings like '010.0.0.1' and '10.0.0.1' share one index.
+    """
+    idx = packed_to_idx.get(packed)
+    if idx is None:
+        idx = packed_to_idx[packed] = len(ip_packed)
+        ip_packed.append(packed)
+    return idx
+
+
+def collect_failed_attempts(mm, packed_to_idx, ip_packed, ip_idx, ts_list, start=0, end=None):
+    """
+    Scan a memory-mapped log and record every failed attempt as one flat row:
+    ip_idx gets the IP's index (see _index_ip; assigned on first sight), ts_list its
+    timestamp; both are array('q') so rows are stored as contiguous int64s.
+    packed_to_idx maps packed address -> index (see _index_ip); raw address bytes go
+    through a local raw_to_idx dict, so pack_ip runs once per distinct spelling
+    rather than once per line.
+    Only the byte range [start, end) is read; it should begin at a line start.
+    Ranges of JIT_MIN_BYTES or more go through the numba scanner when numba is installed.
+    Otherwise lines are found by searching the raw bytes for 'Failed password' and matched
+    in place with _LINE_RE_B; only the captured timestamp and IP are decoded.
+    This is IPv4-only: failed logins from IPv6 addresses or hostnames do not match,
+    and neither do addresses with an octet above 255, so they are left out of the
+    brute-force report.
+    """
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+    size = len(mm) if end is None else end
+    if size - start >= JIT_MIN_BYTES and _load_jit():
+        buf = np.frombuffer(mm, dtype=np.uint8)
+        ips, tss = _scan_failed_jit(buf, start, size, _FAILED_NEEDLE, _FROM_NEEDLE,
+                                    _MONTH_KEYS, _MONTH_OFFSET_ARR, _MONTH_DAYS_ARR)
+        # drop the buffer export so the caller can close mm
+        del buf
+        # index distinct addresses in first-seen order
+        uniq, first = np.unique(ips, return_index=True)
+        local = np.empty(len(uniq), dtype=np.int64)
+        for k in np.argsort(first):
+            local[k] = _index_ip(packed_to_idx, ip_packed, int(uniq[k]))
+        ip_idx.frombytes(local[np.searchsorted(uniq, ips)].tobytes())
+        ts_list.frombytes(tss.tobytes())
+        return
+    raw_to_idx = {}
+    while start < size:
+        # jump straight to the next 'Failed password' in C; lines without one are never visited
+        hit = mm.find(_FAILED_MARK, start, size)
+        if hit == -1:
+            break
+        line_start = mm.rfind(b"\n", start, hit) + 1 or start
+        nl = mm.find(b"\n", hit, size)
+        if nl == -1:
+            nl = size
+        start = nl + 1
+        # match in place and decode only the two captured fields
+        m = _LINE_RE_B.match(mm, line_start, nl)
+        if m is None:
+            continue
+        try:
+            ts = _syslog_seconds(m.group(1).decode())
+        except (KeyError, ValueError):
+            continue
+        ip = m.group(2)
+        idx = raw_to_idx.get(ip)
+        if idx is None:
+            # new address: pack (and validate) it once
+            try:
+                packed = pack_ip(ip.decode())
+            except ValueError:
+                # octet out of range; the numba scanner drops these too
+                continue
+            idx = raw_to_idx[ip] = _index_ip(packed_to_idx, ip_packed, packed)
+        ip_idx.append(idx)
+        ts_list.append(ts)
+
+
+def group_by_ip(ip_packed, ip_idx, ts_list):
+    """
+    Turn the flat (ip_idx, ts_list) rows into {packed ip: times}, IPs in first-seen order;
+    ip_packed maps an ip_idx value to its packed address.
+    With numpy this is one lexsort plus a split into runs (times come out sorted);
+    without it times stay in log order.
+    """
+    if np is not None:
+        # zero-copy views of the array('q') buffers
+        ip_arr = np.asarray(ip_idx, dtype=np.int64)
+        ts_arr = np.asarray(ts_list, dtype=np.int64)
+        order = np.lexsort((ts_arr, ip_arr))
+        ip_arr = ip_arr[order]
+        ts_arr = ts_arr[order]
+        uniq, first = np.unique(ip_arr, return_index=True)
+        runs = np.split(ts_arr, first[1:])
+        return {ip_packed[k]: run for k, run in zip(uniq, runs)}
+
+    groups = [array("q") for _ in ip_packed]
+    for k, ts in zip(ip_idx, ts_list):
+        groups[k].append(ts)
+    return dict(zip(ip_packed, groups))
+
+
+def parse_chunk(path, start, end):
+    """
+    Process-pool worker: map path again and return (ip_packed, ip_idx, ts_list)
+    for the failed attempts in the byte range [start, end); ip_idx indexes into ip_packed.
+    """
+    packed_to_idx, ip_packed, ip_idx, ts_list = {}, [], array("q"), array("q")
+    with open(path, "rb") as fh:
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            collect_failed_attempts(mm, packed_to_idx, ip_packed, ip_idx, ts_list, start, end)
+    return ip_packed, ip_idx, ts_list
+
+
+def _chunk_bounds(mm, n_chunks):
+    """Split mm into up to n_chunks (start, end) byte ranges that begin on line starts."""
+    size = len(mm)
+    cuts = {0, size}
+    for k in range(1, n_chunks):
+        # back up to the start of the line that contains the even split point
+        cuts.add(mm.rfind(b"\n", 0, size * k // n_chunks) + 1)
+    cuts = sorted(cuts)
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+def load_failed_attempts(path, workers=None):
+    """
+    Build {packed ip: times} of failed attempts in the log at path (see group_by_ip).
+    Only IPv4 sources are counted; see collect_failed_attempts.
+    Large logs are split on line boundaries and parsed across a process pool;
+    chunks are merged in file order, so IPs keep their first-seen order.
+    """
+    packed_to_idx, ip_packed, ip_idx, ts_list = {}, [], array("q"), array("q")
+    workers = workers or os.cpu_count() or 1
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        # mmap fails on an empty file, and there is nothing to read anyway
+        if not size:
+            return {}
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if workers < 2 or size < PARALLEL_MIN_BYTES:
+                collect_failed_attempts(mm, packed_to_idx, ip_packed, ip_idx, ts_list)
+                return group_by_ip(ip_packed, ip_idx, ts_list)
+            bounds = _chunk_bounds(mm, workers)
+
+    starts = [start for start, _ in bounds]
+    ends = [end for _, end in bounds]
+    with ProcessPoolExecutor(max_workers=len(bounds)) as pool:
+        for part_packed, part_idx, part_ts in pool.map(parse_chunk, [path] * len(bounds), starts, ends):
+            # renumber the chunk's local IP indices into the global index
+            remap = [_index_ip(packed_to_idx, ip_packed, packed) for packed in part_packed]
+            ip_idx.extend(remap[k] for k in part_idx)
+            ts_list.extend(part_ts)
+    return group_by_ip(ip_packed, ip_idx, ts_list)
+
+
 def main():
     # Build per-ip timestamps
-    per_ip_timestamps = defaultdict(list)
-
     try:
-        with open(LOGFILE, "r") as fh:
-            for line in fh:
-                ts, ip, event = parse_auth_line(line)
-                if ts and ip and event == "failed":
-                    per_ip_timestamps[ip].append(ts)
+        per_ip_timestamps = load_failed_attempts(LOGFILE)
     except FileNotFoundError:
         print(f"ERROR: Log file '{LOGFILE}' not found. Make sure it's in the current directory.", file=sys.stderr)
         sys.exit(1)
@@ -119,36 +595,42 @@ def main():
     else:
         print("Failed attempts per IP (counts):")
         for ip, times in per_ip_timestamps.items():
-            print(f"  {ip}: {len(times)} failed attempts")
+            print(f"  {unpack_ip(ip)}: {len(times)} failed attempts")
 
-    # detect incidents
-    sus_incidents = brute_force(per_ip_timestamps, max_minutes=10, threshold=5)
+    # detect incidents and stream them to file, keeping only a preview
+    # and the per-IP totals (sum of counts from incidents)
+    preview = []
+    summary = Counter()
 
-    # print preview
-    print()
-    print_incidents_preview(sus_incidents, preview=5)
+    def tally(incidents):
+        for inc in incidents:
+            if len(preview) < 5:
+                preview.append(inc)
+            summary[inc["ip"]] += inc["count"]
+            yield inc
 
-    # save full incidents to file
     with open("bruteforce_incidents.txt", "w") as out:
-        json.dump(sus_incidents, out, indent=2)
-    print("Saved detailed incidents to bruteforce_incidents.txt")
+        # with numpy, group_by_ip hands back runs already sorted by its lexsort
+        incidents = brute_force(per_ip_timestamps, max_minutes=10, threshold=5,
+                                presorted=np is not None)
+        total = write_incidents(tally(incidents), out)
 
-    # Aggregate totals per IP (sum of counts from incidents)
-    summary = {}
-    for inc in sus_incidents:
-        summary[inc["ip"]] = summary.get(inc["ip"], 0) + inc["count"]
+    # print preview
+    print()
+    print_incidents_preview(preview, preview=5, total=total)
+    print("Saved detailed incidents to bruteforce_incidents.txt")
 
     # If there were no incidents but there were failed attempts, consider summarizing by raw counts:
     if not summary and per_ip_timestamps:
         # fallback: total failed attempts per ip
-        summary = {ip: len(times) for ip, times in per_ip_timestamps.items()}
+        summary = Counter({unpack_ip(ip): len(times) for ip, times in per_ip_timestamps.items()})
 
-    # sort top attackers
-    top_attackers = sorted(summary.items(), key=lambda x: x[1], reverse=True)
+    # top attackers (heap-based, no full sort)
+    top_attackers = summary.most_common(10)
 
     if top_attackers:
         print("\nTop attacker IPs:")
-        for ip, count in top_attackers[:10]:
+        for ip, count in top_attackers:
             print(f"  {ip}: {count} failed attempts")
     else:
         print("\nNo attackers to summarize.")
@@ -156,10 +638,15 @@ def main():
     # Try plotting if matplotlib available and there is data
     if top_attackers:
         try:
+            import matplotlib
+            # only bring up a GUI window for interactive runs; batch/CI runs use Agg
+            interactive = sys.stdout.isatty() and bool(os.environ.get("DISPLAY"))
+            if not interactive:
+                matplotlib.use("Agg")
             import matplotlib.pyplot as plt
-            ips = [ip for ip, cnt in top_attackers[:10]]
-            counts = [cnt for ip, cnt in top_attackers[:10]]
-            plt.figure(figsize=(8, 4))
+            ips = [ip for ip, cnt in top_attackers]
+            counts = [cnt for ip, cnt in top_attackers]
+            fig = plt.figure(figsize=(8, 4))
             plt.bar(ips, counts)
             plt.title("Top attacker IPs")
             plt.xlabel("IP")
@@ -168,7 +655,9 @@ def main():
             plt.tight_layout()
             plt.savefig("top_attackers.png")
             print("Saved bar chart to top_attackers.png")
-            plt.show()
+            if interactive:
+                plt.show()
+            plt.close(fig)
         except Exception as e:
             print(f"Matplotlib plotting skipped due to error: {e}", file=sys.stderr)
             print("If you want plotting, ensure matplotlib is installed in the interpreter used to run this script.")
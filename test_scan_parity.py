@@ -0,0 +1,109 @@
+"""
+Randomised parity check between the two failed-line parsers in report.py:
+the numba byte scanner (_scan_failed) and the _LINE_RE_B regex path of
+collect_failed_attempts. Both must keep the same rules (last ' from <ip>',
+IPv4 only, octets <= 255, timestamps range-checked), so any change to one of
+them should keep this passing.
+
+Run with:  python -m unittest test_scan_parity
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+import report
+
+try:
+    import numba  # noqa: F401
+    HAVE_NUMBA = report.np is not None
+except ImportError:
+    HAVE_NUMBA = False
+
+TRIALS = 600
+
+
+def _rnd_ip(rng):
+    c = rng.random()
+    if c < 0.7:
+        return ".".join(str(rng.randint(0, 255)) for _ in range(4))
+    if c < 0.8:
+        # some octets above 255
+        return ".".join(str(rng.randint(0, 400)) for _ in range(4))
+    if c < 0.9:
+        return "2001:db8::" + str(rng.randint(1, 9))
+    return rng.choice(["1.2.3", "1.2.3.4567", "01.002.3.4", "host.example", "1..2.3"])
+
+
+def _rnd_ts(rng):
+    mon = rng.choice(list(report._MONTHS)) if rng.random() < 0.95 else rng.choice(["Xyz", "mar", "Ma"])
+    day = rng.randint(0, 33)
+    day = f"{day:2d}" if rng.random() < 0.5 else f"{day:02d}"
+    return f"{mon} {day} {rng.randint(0, 26):02d}:{rng.randint(0, 62):02d}:{rng.randint(0, 62):02d}"
+
+
+def _rnd_line(rng):
+    # usernames are logged verbatim, so some carry their own ' from <ip>'
+    user = rng.choice(["root", "admin", f"x from {_rnd_ip(rng)}", f"from {_rnd_ip(rng)} from",
+                       "Failed password", "é"])
+    c = rng.random()
+    if c < 0.6:
+        tail = f"Failed password for invalid user {user} from {_rnd_ip(rng)} port {rng.randint(1, 65535)} ssh2"
+    elif c < 0.7:
+        tail = f"Failed password for {user} from {_rnd_ip(rng)}"
+    elif c < 0.8:
+        tail = f"Accepted password for {user} from {_rnd_ip(rng)} port 22 ssh2"
+    else:
+        tail = rng.choice(["pam_unix(sshd:session): session opened", "Failed password",
+                           "from 1.2.3.4 Failed password"])
+    line = f"{_rnd_ts(rng)} host1 sshd[1]: {tail}"
+    if rng.random() < 0.03:
+        # cut-off last write
+        line = line[:rng.randint(0, len(line))]
+    return line
+
+
+def _load(path, jit):
+    saved = report.JIT_MIN_BYTES
+    report.JIT_MIN_BYTES = 0 if jit else float("inf")
+    try:
+        per_ip = report.load_failed_attempts(path, workers=1)
+    finally:
+        report.JIT_MIN_BYTES = saved
+    return [(ip, [int(t) for t in times]) for ip, times in per_ip.items()]
+
+
+@unittest.skipUnless(HAVE_NUMBA, "numba and numpy are needed for the jitted scanner")
+class ScanParityTest(unittest.TestCase):
+
+    def test_random_logs(self):
+        rng = random.Random(0)
+        for _ in range(TRIALS):
+            text = "\n".join(_rnd_line(rng) for _ in range(rng.randint(0, 80)))
+            if rng.random() < 0.5:
+                text += "\n"
+            fd, path = tempfile.mkstemp()
+            try:
+                os.write(fd, text.encode())
+                os.close(fd)
+                self.assertEqual(_load(path, jit=True), _load(path, jit=False), text)
+            finally:
+                os.unlink(path)
+
+    def test_last_from_wins(self):
+        line = ("Mar 10 13:58:01 host1 sshd[1023]: Failed password for invalid user x "
+                "from 8.8.8.8 from 203.0.113.45 port 52344 ssh2\n")
+        fd, path = tempfile.mkstemp()
+        try:
+            os.write(fd, line.encode())
+            os.close(fd)
+            expected = [(report.pack_ip("203.0.113.45"), [report._syslog_seconds("Mar 10 13:58:01")])]
+            self.assertEqual(_load(path, jit=True), expected)
+            self.assertEqual(_load(path, jit=False), expected)
+        finally:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    unittest.main()